@@ -3,7 +3,7 @@
 import logging
 from typing import Any
 
-from ccproxy.config import get_config
+from ccproxy.config import CCProxyConfig, get_config
 from ccproxy.rules import ClassificationRule
 
 logger = logging.getLogger(__name__)
@@ -35,8 +35,13 @@ class RequestClassifier:
                 - model_name: claude-3-5-haiku-20241022
     """
 
-    def __init__(self) -> None:
-        """Initialize the request classifier."""
+    def __init__(self, config: CCProxyConfig | None = None) -> None:
+        """Initialize the request classifier.
+
+        Args:
+            config: Configuration to classify against. Defaults to the global instance from get_config().
+        """
+        self._config = config
         self._rules: list[tuple[str, ClassificationRule]] = []
         self._setup_rules()
 
@@ -50,7 +55,7 @@ class RequestClassifier:
         self._clear_rules()
 
         # Get configuration
-        config = get_config()
+        config = self._get_config()
 
         # Load rules from configuration
         for rule_config in config.rules:
@@ -90,7 +95,7 @@ class RequestClassifier:
             logger.error("Request is not a dict and could not be converted")
             return "default"
 
-        config = get_config()
+        config = self._get_config()
 
         # Evaluate rules in order
         for model_name, rule in self._rules:
@@ -100,6 +105,10 @@ class RequestClassifier:
         # Default if no rules match
         return "default"
 
+    def _get_config(self) -> CCProxyConfig:
+        """Return the injected configuration, falling back to the global instance."""
+        return self._config if self._config is not None else get_config()
+
     def add_rule(self, model_name: str, rule: ClassificationRule) -> None:
         """Add a classification rule with its associated model_name.
 
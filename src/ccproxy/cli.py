@@ -4,6 +4,7 @@ import json
 import logging
 import logging.config
 import os
+import select
 import shutil
 import subprocess
 import sys
@@ -389,6 +390,32 @@ def start_litellm(config_dir: Path, args: list[str] | None = None, detach: bool
             sys.exit(130)
 
 
+def _wait_for_exit(pid: int, timeout: float) -> None:
+    """Wait up to ``timeout`` seconds for a process to exit.
+
+    On Linux the wait returns as soon as the process exits, via a pidfd. Elsewhere,
+    or if the pidfd can't be opened, it falls back to sleeping for the full timeout.
+
+    Args:
+        pid: Process ID to wait on
+        timeout: Maximum number of seconds to wait
+    """
+    try:
+        pidfd = os.pidfd_open(pid)
+    except ProcessLookupError:
+        # Already gone
+        return
+    except (AttributeError, OSError):
+        time.sleep(timeout)
+        return
+
+    try:
+        # A pidfd becomes readable once the process has exited
+        select.select([pidfd], [], [], timeout)
+    finally:
+        os.close(pidfd)
+
+
 def stop_litellm(config_dir: Path) -> bool:
     """Stop the background LiteLLM proxy server.
 
@@ -417,7 +444,7 @@ def stop_litellm(config_dir: Path) -> bool:
             os.kill(pid, 15)  # SIGTERM - graceful shutdown
 
             # Wait a moment for graceful shutdown
-            time.sleep(0.5)
+            _wait_for_exit(pid, timeout=0.5)
 
             # Check if still running
             try:
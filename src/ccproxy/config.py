@@ -37,8 +37,10 @@ litellm --config /etc/litellm/config.yaml
 
 import importlib
 import logging
+import shlex
 import subprocess
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -48,6 +50,9 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed loader; fall back to the pure-Python one when PyYAML lacks it
+_YamlSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class OAuthSource(BaseModel):
     """OAuth token source configuration.
@@ -63,6 +68,67 @@ class OAuthSource(BaseModel):
     """Optional custom User-Agent header to send with requests using this token"""
 
 
+# Characters that make an `echo` command more than a literal for the shell
+_SHELL_METACHARACTERS = frozenset(";|&$`\\*?<>(){}[]~#!\n")
+
+
+def _parse_echo_literal(command: str) -> str | None:
+    """Return what a plain ``echo`` command would print, or None if it needs a shell.
+
+    Lets static tokens such as ``echo 'sk-ant-...'`` load without spawning ``sh -c``.
+    """
+    if any(char in _SHELL_METACHARACTERS for char in command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if len(argv) < 2 or argv[0] != "echo" or argv[1].startswith("-"):
+        return None
+    return " ".join(argv[1:])
+
+
+# `~` is fine in a `cat` path as long as it is the leading, unquoted `~/` the shell would expand
+_CAT_PATH_METACHARACTERS = _SHELL_METACHARACTERS - {"~"}
+
+
+def _parse_cat_path(command: str) -> Path | None:
+    """Return the file a plain ``cat <file>`` command would print, or None if it needs a shell.
+
+    Lets file-backed tokens such as ``cat ~/.config/provider/token`` load without spawning ``sh -c``.
+    """
+    if any(char in _CAT_PATH_METACHARACTERS for char in command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if len(argv) != 2 or argv[0] != "cat" or argv[1].startswith("-"):
+        return None
+    path = Path(argv[1])
+    if "~" in command:
+        # Only the current user's home (`~/...`) is expanded in-process
+        if not command.split()[1].startswith("~/") or argv[1].count("~") != 1:
+            return None
+        path = path.expanduser()
+    return path
+
+
+# Upper bound on OAuth commands run at once, however many providers are configured
+_OAUTH_COMMAND_MAX_WORKERS = 8
+
+
+def _run_oauth_command(command: str) -> subprocess.CompletedProcess[str]:
+    """Run a user-configured OAuth token command through the shell."""
+    return subprocess.run(  # noqa: S602
+        command,
+        shell=True,  # Intentional: command is user-configured
+        capture_output=True,
+        text=True,
+        timeout=5,  # 5 second timeout
+    )
+
+
 # Import proxy_server to access runtime configuration
 try:
     from litellm.proxy import proxy_server
@@ -208,10 +274,13 @@ class CCProxyConfig(BaseSettings):
         return self._oat_user_agents.get(provider)
 
     def _load_credentials(self) -> None:
-        """Execute shell commands to load OAuth tokens for all configured providers at startup.
+        """Load OAuth tokens for all configured providers at startup.
+
+        Plain ``echo <token>`` and ``cat <file>`` sources are resolved in-process; every other
+        command is executed through the shell. Providers whose source fails are logged and skipped.
 
         Raises:
-            RuntimeError: If any shell command fails to execute or returns empty token
+            RuntimeError: If every configured provider fails to produce a non-empty token
         """
         if not self.oat_sources:
             # No OAuth sources configured
@@ -223,41 +292,69 @@ class CCProxyConfig(BaseSettings):
         loaded_user_agents = {}
         errors = []
 
+        # Normalize to OAuthSource for consistent handling
+        oauth_sources: dict[str, OAuthSource] = {}
         for provider, source in self.oat_sources.items():
-            # Normalize to OAuthSource for consistent handling
             if isinstance(source, str):
-                oauth_source = OAuthSource(command=source)
+                oauth_sources[provider] = OAuthSource(command=source)
             elif isinstance(source, OAuthSource):
-                oauth_source = source
+                oauth_sources[provider] = source
             elif isinstance(source, dict):
                 # Handle dict from YAML
-                oauth_source = OAuthSource(**source)
+                oauth_sources[provider] = OAuthSource(**source)
             else:
                 error_msg = f"Invalid OAuth source type for provider '{provider}': {type(source)}"
                 logger.error(error_msg)
                 errors.append(error_msg)
-                continue
 
+        # Static `echo` tokens and plain `cat <file>` reads are resolved in-process; anything else
+        # goes through the shell. A lone shell command runs inline; several run concurrently on a
+        # bounded pool so startup waits on the slowest source, not their sum.
+        static_sources: dict[str, str | Path | None] = {}
+        for provider, source in oauth_sources.items():
+            literal = _parse_echo_literal(source.command)
+            static_sources[provider] = literal if literal is not None else _parse_cat_path(source.command)
+        shell_providers = [provider for provider, static in static_sources.items() if static is None]
+        pending: dict[str, Future[subprocess.CompletedProcess[str]]] = {}
+        if len(shell_providers) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(shell_providers), _OAUTH_COMMAND_MAX_WORKERS)) as pool:
+                pending = {
+                    provider: pool.submit(_run_oauth_command, oauth_sources[provider].command)
+                    for provider in shell_providers
+                }
+
+        for provider, oauth_source in oauth_sources.items():
             try:
-                # Execute shell command
-                result = subprocess.run(  # noqa: S602
-                    oauth_source.command,
-                    shell=True,  # Intentional: command is user-configured
-                    capture_output=True,
-                    text=True,
-                    timeout=5,  # 5 second timeout
-                )
+                static = static_sources[provider]
+                if isinstance(static, Path):
+                    try:
+                        token = static.read_text()
+                    except OSError as e:
+                        # Mirror what `cat` would report through the shell path
+                        error_msg = (
+                            f"OAuth command for provider '{provider}' could not read {static}: {e.strerror or e}"
+                        )
+                        logger.error(error_msg)
+                        errors.append(error_msg)
+                        continue
+                elif static is not None:
+                    token = static
+                else:
+                    future = pending.get(provider)
+                    result = future.result() if future is not None else _run_oauth_command(oauth_source.command)
 
-                if result.returncode != 0:
-                    error_msg = (
-                        f"OAuth command for provider '{provider}' failed with exit code "
-                        f"{result.returncode}: {result.stderr.strip()}"
-                    )
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-                    continue
+                    if result.returncode != 0:
+                        error_msg = (
+                            f"OAuth command for provider '{provider}' failed with exit code "
+                            f"{result.returncode}: {result.stderr.strip()}"
+                        )
+                        logger.error(error_msg)
+                        errors.append(error_msg)
+                        continue
+
+                    token = result.stdout
 
-                token = result.stdout.strip()
+                token = token.strip()
                 if not token:
                     error_msg = f"OAuth command for provider '{provider}' returned empty output"
                     logger.error(error_msg)
@@ -373,63 +470,87 @@ class CCProxyConfig(BaseSettings):
         # Load YAML if it exists
         if yaml_path.exists():
             with yaml_path.open() as f:
-                data = yaml.safe_load(f) or {}
-
-                # Get ccproxy section
-                ccproxy_data = data.get("ccproxy", {})
-
-                # Apply basic settings
-                if "debug" in ccproxy_data:
-                    instance.debug = ccproxy_data["debug"]
-                if "metrics_enabled" in ccproxy_data:
-                    instance.metrics_enabled = ccproxy_data["metrics_enabled"]
-                if "default_model_passthrough" in ccproxy_data:
-                    instance.default_model_passthrough = ccproxy_data["default_model_passthrough"]
-                if "oat_sources" in ccproxy_data:
-                    instance.oat_sources = ccproxy_data["oat_sources"]
-
-                # Backwards compatibility: migrate deprecated 'credentials' field
-                if "credentials" in ccproxy_data:
-                    logger.error(
-                        "DEPRECATED: The 'credentials' field is deprecated and will be removed in a future version. "
-                        "Please migrate to 'oat_sources' in your ccproxy.yaml configuration. "
-                        "Example:\n"
-                        "  oat_sources:\n"
-                        "    anthropic: \"jq -r '.claudeAiOauth.accessToken' ~/.claude/.credentials.json\"\n"
-                        "The deprecated 'credentials' field has been automatically migrated to "
-                        "oat_sources['anthropic'] for this session."
-                    )
-                    # Migrate credentials to oat_sources for anthropic provider
-                    if "anthropic" not in instance.oat_sources:
-                        instance.oat_sources["anthropic"] = ccproxy_data["credentials"]
-                    else:
-                        logger.warning(
-                            "Both 'credentials' and 'oat_sources[\"anthropic\"]' are configured. "
-                            "Using 'oat_sources[\"anthropic\"]' and ignoring deprecated 'credentials' field."
-                        )
+                instance._apply_yaml_data(yaml.load(f, Loader=_YamlSafeLoader) or {})  # noqa: S506 - safe loader
+
+        # Load credentials at startup (raises RuntimeError if fails)
+        instance._load_credentials()
+
+        return instance
+
+    @classmethod
+    def from_yaml_string(cls, text: str, **kwargs: Any) -> "CCProxyConfig":
+        """Load configuration from ccproxy.yaml content held in memory.
+
+        Args:
+            text: YAML document in the ccproxy.yaml format
+            **kwargs: Additional keyword arguments
 
-                # Load hooks
-                hooks_data = ccproxy_data.get("hooks", [])
-                if hooks_data:
-                    instance.hooks = hooks_data
-
-                # Load rules
-                rules_data = ccproxy_data.get("rules", [])
-                instance.rules = []
-                for rule_data in rules_data:
-                    if isinstance(rule_data, dict):
-                        name = rule_data.get("name", "")
-                        rule_path = rule_data.get("rule", "")
-                        params = rule_data.get("params", [])
-                        if name and rule_path:
-                            rule_config = RuleConfig(name, rule_path, params)
-                            instance.rules.append(rule_config)
+        Returns:
+            CCProxyConfig instance
+
+        Raises:
+            RuntimeError: If credentials shell command fails during startup
+        """
+        instance = cls(**kwargs)
+        instance._apply_yaml_data(yaml.load(text, Loader=_YamlSafeLoader) or {})  # noqa: S506 - safe loader
 
         # Load credentials at startup (raises RuntimeError if fails)
         instance._load_credentials()
 
         return instance
 
+    def _apply_yaml_data(self, data: dict[str, Any]) -> None:
+        """Apply the settings from a parsed ccproxy.yaml document to this instance."""
+        # Get ccproxy section
+        ccproxy_data = data.get("ccproxy", {})
+
+        # Apply basic settings
+        if "debug" in ccproxy_data:
+            self.debug = ccproxy_data["debug"]
+        if "metrics_enabled" in ccproxy_data:
+            self.metrics_enabled = ccproxy_data["metrics_enabled"]
+        if "default_model_passthrough" in ccproxy_data:
+            self.default_model_passthrough = ccproxy_data["default_model_passthrough"]
+        if "oat_sources" in ccproxy_data:
+            self.oat_sources = ccproxy_data["oat_sources"]
+
+        # Backwards compatibility: migrate deprecated 'credentials' field
+        if "credentials" in ccproxy_data:
+            logger.error(
+                "DEPRECATED: The 'credentials' field is deprecated and will be removed in a future version. "
+                "Please migrate to 'oat_sources' in your ccproxy.yaml configuration. "
+                "Example:\n"
+                "  oat_sources:\n"
+                "    anthropic: \"jq -r '.claudeAiOauth.accessToken' ~/.claude/.credentials.json\"\n"
+                "The deprecated 'credentials' field has been automatically migrated to "
+                "oat_sources['anthropic'] for this session."
+            )
+            # Migrate credentials to oat_sources for anthropic provider
+            if "anthropic" not in self.oat_sources:
+                self.oat_sources["anthropic"] = ccproxy_data["credentials"]
+            else:
+                logger.warning(
+                    "Both 'credentials' and 'oat_sources[\"anthropic\"]' are configured. "
+                    "Using 'oat_sources[\"anthropic\"]' and ignoring deprecated 'credentials' field."
+                )
+
+        # Load hooks
+        hooks_data = ccproxy_data.get("hooks", [])
+        if hooks_data:
+            self.hooks = hooks_data
+
+        # Load rules
+        rules_data = ccproxy_data.get("rules", [])
+        self.rules = []
+        for rule_data in rules_data:
+            if isinstance(rule_data, dict):
+                name = rule_data.get("name", "")
+                rule_path = rule_data.get("rule", "")
+                params = rule_data.get("params", [])
+                if name and rule_path:
+                    rule_config = RuleConfig(name, rule_path, params)
+                    self.rules.append(rule_config)
+
 
 # Global configuration instance
 _config_instance: CCProxyConfig | None = None
@@ -7,7 +7,7 @@ from litellm.integrations.custom_logger import CustomLogger
 from rich import print
 
 from ccproxy.classifier import RequestClassifier
-from ccproxy.config import get_config
+from ccproxy.config import CCProxyConfig, get_config
 from ccproxy.router import get_router
 from ccproxy.utils import calculate_duration_ms
 
@@ -27,13 +27,16 @@ class RequestData(TypedDict, total=False):
 class CCProxyHandler(CustomLogger):
     """Main module of ccproxy, an instance of CCProxyHandler is instantiated in the LiteLLM callback python script"""
 
-    def __init__(self) -> None:
+    def __init__(self, config: CCProxyConfig | None = None) -> None:
         super().__init__()
-        self.classifier = RequestClassifier()
+        # Resolve the config once; the classifier and routing-decision logging read it from here.
+        # Hooks are plain functions called by LiteLLM and still resolve it through get_config().
+        config = config if config is not None else get_config()
+        self._config = config
+        self.classifier = RequestClassifier(config=config)
         self.router = get_router()
         self._langfuse_client = None
 
-        config = get_config()
         if config.debug:
             logger.setLevel(logging.DEBUG)
 
@@ -120,11 +123,8 @@ class CCProxyHandler(CustomLogger):
             model_config: Model configuration from router (None if fallback or passthrough)
             is_passthrough: Whether this was a passthrough decision (no rule applied + passthrough enabled)
         """
-        # Get config to check debug mode
-        config = get_config()
-
         # Only display colored routing decision when debug is enabled
-        if config.debug:
+        if self._config.debug:
             from rich.console import Console
             from rich.panel import Panel
             from rich.text import Text
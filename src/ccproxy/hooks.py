@@ -1,3 +1,4 @@
+import functools
 import logging
 import re
 import threading
@@ -23,10 +24,10 @@ _STORE_TTL = 60.0  # Clean up entries older than 60 seconds
 
 def store_request_metadata(call_id: str, metadata: dict[str, Any]) -> None:
     """Store metadata for a request by its call ID."""
+    now = time.time()
     with _store_lock:
-        _request_metadata_store[call_id] = (metadata, time.time())
+        _request_metadata_store[call_id] = (metadata, now)
         # Clean up old entries
-        now = time.time()
         expired = [k for k, (_, ts) in _request_metadata_store.items() if now - ts > _STORE_TTL]
         for k in expired:
             del _request_metadata_store[k]
@@ -51,9 +52,11 @@ ANTHROPIC_BETA_HEADERS = [
 ]
 
 # Headers containing secrets - redact but show prefix/suffix for identification
-SENSITIVE_PATTERNS = {
-    "authorization": r"^(Bearer sk-[a-z]+-|Bearer |sk-[a-z]+-)",  # Keep "Bearer sk-ant-" or "Bearer " or "sk-ant-"
-    "x-api-key": r"^(sk-[a-z]+-)",
+# Patterns are compiled once at import since _redact_value runs for every captured header
+SENSITIVE_PATTERNS: dict[str, re.Pattern[str] | None] = {
+    # Keep "Bearer sk-ant-" or "Bearer " or "sk-ant-"
+    "authorization": re.compile(r"^(Bearer sk-[a-z]+-|Bearer |sk-[a-z]+-)"),
+    "x-api-key": re.compile(r"^(sk-[a-z]+-)"),
     "cookie": None,  # Fully redact
 }
 
@@ -65,13 +68,29 @@ def _redact_value(header: str, value: str) -> str:
         pattern = SENSITIVE_PATTERNS[header_lower]
         if pattern is None:
             return "[REDACTED]"
-        match = re.match(pattern, value)
+        match = pattern.match(value)
         prefix = match.group(0) if match else ""
         suffix = value[-4:] if len(value) > 8 else ""
         return f"{prefix}...{suffix}"
     return str(value)[:200]
 
 
+@functools.lru_cache(maxsize=1024)
+def _detect_provider(model: str, custom_provider: str | None, api_base: str | None) -> str:
+    """Resolve the provider for a routed model via LiteLLM's provider detection.
+
+    The result depends only on the arguments, so lookups are memoized. Failures raise and
+    are not cached. In passthrough mode the model is whatever the client sent, so keys are
+    client-controlled; the maxsize bound is what keeps the cache from growing without limit.
+    """
+    _, provider_name, _, _ = get_llm_provider(
+        model=model,
+        custom_llm_provider=custom_provider,
+        api_base=api_base,
+    )
+    return provider_name
+
+
 def rule_evaluator(data: dict[str, Any], user_api_key_dict: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
     classifier = kwargs.get("classifier")
     if not isinstance(classifier, RequestClassifier):
@@ -229,6 +248,7 @@ def capture_headers(data: dict[str, Any], user_api_key_dict: dict[str, Any], **k
 
     # Get optional headers filter from params
     headers_filter: list[str] | None = kwargs.get("headers")
+    allowed_headers = {h.lower() for h in headers_filter} if headers_filter is not None else None
 
     request = data.get("proxy_server_request", {})
     headers = request.get("headers", {})
@@ -248,9 +268,8 @@ def capture_headers(data: dict[str, Any], user_api_key_dict: dict[str, Any], **k
             continue
         name_lower = name.lower()
         # Filter headers if a filter list is provided
-        if headers_filter is not None:
-            if name_lower not in [h.lower() for h in headers_filter]:
-                continue
+        if allowed_headers is not None and name_lower not in allowed_headers:
+            continue
         # Add to trace_metadata with header_ prefix
         redacted_value = _redact_value(name, str(value))
         trace_metadata[f"header_{name_lower}"] = redacted_value
@@ -319,13 +338,8 @@ def forward_oauth(data: dict[str, Any], user_api_key_dict: dict[str, Any], **kwa
         return data
 
     # Use LiteLLM's official provider detection
-    # Returns: (model, custom_llm_provider, dynamic_api_key, api_base)
     try:
-        _, provider_name, _, _ = get_llm_provider(
-            model=routed_model,
-            custom_llm_provider=custom_provider,
-            api_base=api_base,
-        )
+        provider_name = _detect_provider(routed_model, custom_provider, api_base)
     except Exception as e:
         # If provider detection fails, skip OAuth forwarding
         logger.debug(f"Could not determine provider for model {routed_model}: {e}")
@@ -458,11 +472,7 @@ def add_beta_headers(data: dict[str, Any], user_api_key_dict: dict[str, Any], **
     custom_provider = litellm_params.get("custom_llm_provider")
 
     try:
-        _, provider_name, _, _ = get_llm_provider(
-            model=routed_model,
-            custom_llm_provider=custom_provider,
-            api_base=api_base,
-        )
+        provider_name = _detect_provider(routed_model, custom_provider, api_base)
     except Exception:
         return data
 
@@ -1,17 +1,27 @@
 """Shared test fixtures and helpers."""
 
-from unittest.mock import MagicMock, patch
+import sys
+from contextlib import contextmanager
+from types import SimpleNamespace
 
 import pytest
 
 from ccproxy.config import clear_config_instance
+from ccproxy.hooks import _detect_provider
 from ccproxy.router import clear_router
 
 
 @pytest.fixture(autouse=True)
-def cleanup():
-    """Ensure clean state between tests."""
+def cleanup(request):
+    """Ensure clean state between tests.
+
+    Tests marked ``no_global_state`` never touch the config/router singletons and skip the reset.
+    The provider-detection cache is always cleared so patched get_llm_provider results never leak.
+    """
     yield
+    _detect_provider.cache_clear()
+    if request.node.get_closest_marker("no_global_state"):
+        return
     # Clean up singleton instances
     clear_config_instance()
     clear_router()
@@ -25,25 +35,37 @@ def mock_proxy_server():
         if model_list is None:
             model_list = []
 
-        mock_proxy_server = MagicMock()
-        mock_proxy_server.llm_router = MagicMock()
-        mock_proxy_server.llm_router.model_list = model_list
+        # Plain namespaces: only llm_router.model_list is read, so no MagicMock child bookkeeping
+        mock_proxy_server = SimpleNamespace(llm_router=SimpleNamespace(model_list=model_list))
 
         # Create a mock module that contains proxy_server
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
-
-        return mock_module
+        return SimpleNamespace(proxy_server=mock_proxy_server)
 
     return _create_mock
 
 
+@contextmanager
+def _installed_litellm_proxy(mock_module):
+    """Install ``mock_module`` as litellm.proxy, touching only that sys.modules entry.
+
+    patch.dict("sys.modules", ...) would copy and restore every loaded module on each use.
+    """
+    original = sys.modules.get("litellm.proxy")
+    sys.modules["litellm.proxy"] = mock_module
+    try:
+        yield
+    finally:
+        if original is None:
+            sys.modules.pop("litellm.proxy", None)
+        else:
+            sys.modules["litellm.proxy"] = original
+
+
 @pytest.fixture
 def patch_litellm_proxy(mock_proxy_server):
     """Patch litellm.proxy module to use mock proxy_server."""
 
     def _patch(model_list=None):
-        mock_module = mock_proxy_server(model_list)
-        return patch.dict("sys.modules", {"litellm.proxy": mock_module})
+        return _installed_litellm_proxy(mock_proxy_server(model_list))
 
     return _patch
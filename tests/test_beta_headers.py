@@ -4,17 +4,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from ccproxy.config import clear_config_instance
 from ccproxy.hooks import ANTHROPIC_BETA_HEADERS, add_beta_headers
-from ccproxy.router import clear_router
-
-
-@pytest.fixture
-def cleanup():
-    """Clean up config and router after each test."""
-    yield
-    clear_config_instance()
-    clear_router()
 
 
 @pytest.fixture
@@ -60,7 +50,7 @@ def openai_model_data():
 class TestAddBetaHeaders:
     """Tests for the add_beta_headers hook."""
 
-    def test_adds_beta_headers_for_anthropic(self, anthropic_model_data, cleanup):
+    def test_adds_beta_headers_for_anthropic(self, anthropic_model_data):
         """Verify all required beta headers are added for Anthropic provider."""
         result = add_beta_headers(anthropic_model_data, {})
 
@@ -73,14 +63,14 @@ class TestAddBetaHeaders:
         for expected in ANTHROPIC_BETA_HEADERS:
             assert expected in beta_values, f"Missing beta header: {expected}"
 
-    def test_skips_non_anthropic_providers(self, openai_model_data, cleanup):
+    def test_skips_non_anthropic_providers(self, openai_model_data):
         """Verify no headers added for non-Anthropic providers."""
         result = add_beta_headers(openai_model_data, {})
 
         extra_headers = result.get("provider_specific_header", {}).get("extra_headers", {})
         assert "anthropic-beta" not in extra_headers
 
-    def test_merges_with_existing_beta_headers(self, anthropic_model_data, cleanup):
+    def test_merges_with_existing_beta_headers(self, anthropic_model_data):
         """Verify existing beta headers are preserved and merged."""
         existing_beta = "some-custom-beta-2025"
         anthropic_model_data["provider_specific_header"]["extra_headers"]["anthropic-beta"] = (
@@ -99,7 +89,7 @@ class TestAddBetaHeaders:
         # Original custom header preserved
         assert existing_beta in beta_values
 
-    def test_deduplicates_beta_headers(self, anthropic_model_data, cleanup):
+    def test_deduplicates_beta_headers(self, anthropic_model_data):
         """Verify duplicate beta headers are removed."""
         # Pre-populate with a header that will be added by the hook
         anthropic_model_data["provider_specific_header"]["extra_headers"]["anthropic-beta"] = (
@@ -114,7 +104,7 @@ class TestAddBetaHeaders:
         # Should only appear once
         assert beta_values.count("oauth-2025-04-20") == 1
 
-    def test_skips_when_no_routed_model(self, cleanup):
+    def test_skips_when_no_routed_model(self):
         """Verify hook skips gracefully when no routed model in metadata."""
         data = {
             "model": "anthropic/claude-sonnet-4-5-20250929",
@@ -128,7 +118,7 @@ class TestAddBetaHeaders:
         extra_headers = result.get("provider_specific_header", {}).get("extra_headers", {})
         assert "anthropic-beta" not in extra_headers
 
-    def test_creates_header_structure_if_missing(self, cleanup):
+    def test_creates_header_structure_if_missing(self):
         """Verify hook creates provider_specific_header structure if missing."""
         data = {
             "model": "anthropic/claude-sonnet-4-5-20250929",
@@ -147,7 +137,7 @@ class TestAddBetaHeaders:
         assert "extra_headers" in result["provider_specific_header"]
         assert "anthropic-beta" in result["provider_specific_header"]["extra_headers"]
 
-    def test_handles_none_model_config(self, cleanup):
+    def test_handles_none_model_config(self):
         """Verify hook handles None model_config gracefully (passthrough mode)."""
         data = {
             "model": "anthropic/claude-sonnet-4-5-20250929",
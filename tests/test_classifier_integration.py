@@ -3,7 +3,7 @@
 import pytest
 
 from ccproxy.classifier import RequestClassifier
-from ccproxy.config import CCProxyConfig, RuleConfig, clear_config_instance, set_config_instance
+from ccproxy.config import CCProxyConfig, RuleConfig, set_config_instance
 
 
 class TestRequestClassifierIntegration:
@@ -26,12 +26,8 @@ class TestRequestClassifierIntegration:
     def classifier(self, config: CCProxyConfig) -> RequestClassifier:
         """Create a classifier with all rules configured."""
         # Set the test config as the global config
-        clear_config_instance()
         set_config_instance(config)
-        try:
-            yield RequestClassifier()
-        finally:
-            clear_config_instance()
+        yield RequestClassifier()
 
     def test_priority_1_token_count_overrides_all(self, classifier: RequestClassifier) -> None:
         """Test that large context has highest priority."""
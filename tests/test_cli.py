@@ -1,8 +1,10 @@
 """Tests for the ccproxy CLI."""
 
+import errno
 import json
 import os
 import subprocess
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -15,6 +17,7 @@ from ccproxy.cli import (
     Start,
     Status,
     Stop,
+    _wait_for_exit,
     generate_handler_file,
     install_config,
     main,
@@ -725,8 +728,8 @@ class TestStopLiteLLM:
         assert "No LiteLLM server is running (PID file not found)" in captured.err
 
     @patch("os.kill")
-    @patch("time.sleep")
-    def test_stop_successful(self, mock_sleep: Mock, mock_kill: Mock, tmp_path: Path, capsys) -> None:
+    @patch("ccproxy.cli._wait_for_exit")
+    def test_stop_successful(self, mock_wait: Mock, mock_kill: Mock, tmp_path: Path, capsys) -> None:
         """Test successful stop of running process."""
         pid_file = tmp_path / "litellm.lock"
         pid_file.write_text("12345")
@@ -749,10 +752,11 @@ class TestStopLiteLLM:
         assert mock_kill.call_count == 3
         mock_kill.assert_any_call(12345, 0)  # Check if running
         mock_kill.assert_any_call(12345, 15)  # SIGTERM
+        mock_wait.assert_called_once_with(12345, timeout=0.5)
 
     @patch("os.kill")
-    @patch("time.sleep")
-    def test_stop_force_kill(self, mock_sleep: Mock, mock_kill: Mock, tmp_path: Path, capsys) -> None:
+    @patch("ccproxy.cli._wait_for_exit")
+    def test_stop_force_kill(self, mock_wait: Mock, mock_kill: Mock, tmp_path: Path, capsys) -> None:
         """Test force kill when process doesn't respond to SIGTERM."""
         pid_file = tmp_path / "litellm.lock"
         pid_file.write_text("12345")
@@ -801,6 +805,37 @@ class TestStopLiteLLM:
         assert "Error reading PID file" in captured.err
 
 
+class TestWaitForExit:
+    """Test suite for _wait_for_exit helper."""
+
+    @pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="pidfd_open is Linux-only")
+    def test_returns_when_process_exits(self) -> None:
+        """Test the wait ends on process exit rather than running out the timeout."""
+        process = subprocess.Popen(["sleep", "0.1"])  # noqa: S607
+        try:
+            start = time.monotonic()
+            _wait_for_exit(process.pid, timeout=10)
+            assert time.monotonic() - start < 5
+        finally:
+            process.wait()
+
+    @patch("time.sleep")
+    def test_already_exited(self, mock_sleep: Mock) -> None:
+        """Test no wait happens when the process is already gone."""
+        with patch("os.pidfd_open", side_effect=ProcessLookupError(), create=True):
+            _wait_for_exit(12345, timeout=0.5)
+
+        mock_sleep.assert_not_called()
+
+    @patch("time.sleep")
+    def test_falls_back_to_sleep_without_pidfd(self, mock_sleep: Mock) -> None:
+        """Test the fixed sleep is used when pidfds are unavailable."""
+        with patch("os.pidfd_open", side_effect=OSError(errno.ENOSYS, "not implemented"), create=True):
+            _wait_for_exit(12345, timeout=0.5)
+
+        mock_sleep.assert_called_once_with(0.5)
+
+
 class TestViewLogs:
     """Test suite for view_logs function."""
 
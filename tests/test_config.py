@@ -1,15 +1,66 @@
 """Tests for configuration management."""
 
+import concurrent.futures
+import os
+import subprocess
 import tempfile
+import threading
 from pathlib import Path
 from unittest import mock
 
+import pytest
+
 from ccproxy.config import (
+    _OAUTH_COMMAND_MAX_WORKERS,
     CCProxyConfig,
     RuleConfig,
-    clear_config_instance,
+    _parse_cat_path,
+    _parse_echo_literal,
     get_config,
+    set_config_instance,
 )
+from ccproxy.rules import TokenCountRule
+
+_NO_CCPROXY_SECTION_YAML = """
+# Empty YAML or missing ccproxy section
+other_settings:
+  key: value
+"""
+
+_CUSTOM_RULE_YAML = """
+ccproxy:
+  debug: true
+  metrics_enabled: false
+  rules:
+    - name: custom_rule
+      rule: ccproxy.rules.TokenCountRule
+      params:
+        - threshold: 70000
+"""
+
+# Deprecated 'credentials' is migrated to oat_sources["anthropic"]
+_MIGRATED_CREDENTIALS_YAML = """
+ccproxy:
+  default_model_passthrough: false
+  oat_sources:
+    gemini: "echo gemini-tok"
+  credentials: "echo tok"
+"""
+
+# oat_sources["anthropic"] wins over the deprecated 'credentials' field
+_CONFLICTING_CREDENTIALS_YAML = """
+ccproxy:
+  default_model_passthrough: false
+  oat_sources:
+    anthropic: "echo tok"
+  credentials: "echo ignored-tok"
+"""
+
+
+@pytest.fixture(scope="module")
+def yaml_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Scratch directory shared by the YAML-parsing tests in this module."""
+    return tmp_path_factory.mktemp("ccproxy_yaml")
 
 
 class TestCCProxyConfig:
@@ -42,8 +93,6 @@ class TestCCProxyConfig:
 
         # Create instance
         instance = rule.create_instance()
-        from ccproxy.rules import TokenCountRule
-
         assert isinstance(instance, TokenCountRule)
 
     def test_from_yaml_files(self) -> None:
@@ -104,55 +153,60 @@ model_list:
             ccproxy_path.unlink()
             litellm_path.unlink()
 
-    def test_from_yaml_no_ccproxy_section(self) -> None:
-        """Test loading ccproxy.yaml without ccproxy section."""
-        yaml_content = """
-# Empty YAML or missing ccproxy section
-other_settings:
-  key: value
-"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
-
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
-
-            # Should use defaults
-            assert config.debug is False
-            assert config.metrics_enabled is True
-            assert config.rules == []
-
-        finally:
-            yaml_path.unlink()
-
-    def test_yaml_config_values(self) -> None:
-        """Test that YAML config values are loaded correctly."""
-        yaml_content = """
-ccproxy:
-  debug: true
-  metrics_enabled: false
-  rules:
-    - name: custom_rule
-      rule: ccproxy.rules.TokenCountRule
-      params:
-        - threshold: 70000
-"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
-
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
-            # YAML values should be loaded
-            assert config.debug is True
-            assert config.metrics_enabled is False
-            assert len(config.rules) == 1
-            assert config.rules[0].model_name == "custom_rule"
-            assert config.rules[0].params == [{"threshold": 70000}]
-
-        finally:
-            yaml_path.unlink()
+    @pytest.mark.parametrize(
+        ("yaml_content", "debug", "metrics_enabled", "rules"),
+        [
+            pytest.param(_NO_CCPROXY_SECTION_YAML, False, True, [], id="no_ccproxy_section"),
+            pytest.param(_CUSTOM_RULE_YAML, True, False, [("custom_rule", [{"threshold": 70000}])], id="custom_values"),
+        ],
+    )
+    def test_yaml_config_values(
+        self,
+        yaml_dir: Path,
+        request: pytest.FixtureRequest,
+        yaml_content: str,
+        debug: bool,
+        metrics_enabled: bool,
+        rules: list[tuple[str, list[dict[str, int]]]],
+    ) -> None:
+        """Test that ccproxy.yaml values are loaded, falling back to defaults without a ccproxy section."""
+        yaml_path = yaml_dir / f"{request.node.callspec.id}.yaml"
+        yaml_path.write_text(yaml_content)
+
+        config = CCProxyConfig.from_yaml(yaml_path)
+
+        assert config.debug is debug
+        assert config.metrics_enabled is metrics_enabled
+        assert [(rule.model_name, rule.params) for rule in config.rules] == rules
+
+    @pytest.mark.parametrize(
+        ("yaml_content", "anthropic_token"),
+        [
+            pytest.param(_CUSTOM_RULE_YAML, None, id="custom_rule"),
+            pytest.param(_MIGRATED_CREDENTIALS_YAML, "tok", id="migrated_credentials"),
+            pytest.param(_CONFLICTING_CREDENTIALS_YAML, "tok", id="conflicting_credentials"),
+        ],
+    )
+    def test_from_yaml_string_matches_from_yaml(
+        self, request: pytest.FixtureRequest, yaml_dir: Path, yaml_content: str, anthropic_token: str | None
+    ) -> None:
+        """Test that in-memory YAML yields the same settings as the file-based loader."""
+        yaml_path = yaml_dir / f"string_parity_{request.node.callspec.id}.yaml"
+        yaml_path.write_text(yaml_content)
+
+        from_file = CCProxyConfig.from_yaml(yaml_path)
+        from_string = CCProxyConfig.from_yaml_string(yaml_content)
+
+        assert from_string.debug is from_file.debug
+        assert from_string.metrics_enabled is from_file.metrics_enabled
+        assert from_string.default_model_passthrough is from_file.default_model_passthrough
+        assert from_string.oat_sources == from_file.oat_sources
+        assert from_string.get_oauth_token("anthropic") == from_file.get_oauth_token("anthropic") == anthropic_token
+        assert [(r.model_name, r.params) for r in from_string.rules] == [
+            (r.model_name, r.params) for r in from_file.rules
+        ]
+        # No file backs the in-memory config, so the default path is kept
+        assert from_string.ccproxy_config_path == Path("./ccproxy.yaml")
 
     def test_hook_parameters_from_yaml(self) -> None:
         """Test that hooks with parameters are loaded correctly."""
@@ -239,25 +293,16 @@ class TestConfigSingleton:
 
     def test_get_config_singleton(self) -> None:
         """Test that get_config returns the same instance."""
-        # Clear any existing instance
-        clear_config_instance()
-
         # Create a custom config instance and set it directly
         custom_config = CCProxyConfig(debug=True, metrics_enabled=False)
-        from ccproxy.config import set_config_instance
-
         set_config_instance(custom_config)
 
-        try:
-            config1 = get_config()
-            config2 = get_config()
-
-            assert config1 is config2
-            assert config1.debug is True
-            assert config1.metrics_enabled is False
+        config1 = get_config()
+        config2 = get_config()
 
-        finally:
-            clear_config_instance()
+        assert config1 is config2
+        assert config1.debug is True
+        assert config1.metrics_enabled is False
 
 
 class TestProxyRuntimeConfig:
@@ -368,9 +413,6 @@ ccproxy:
 
     def test_get_config_uses_runtime_when_available(self) -> None:
         """Test that get_config prefers runtime config when available."""
-        # Clear any existing instance
-        clear_config_instance()
-
         # Mock proxy_server
         mock_proxy_server = mock.MagicMock()
         mock_proxy_server.general_settings = {}
@@ -399,8 +441,6 @@ ccproxy:
             ccproxy_yaml.write_text(ccproxy_yaml_content)
 
             # Change to the temp directory so ./ccproxy.yaml exists
-            import os
-
             original_cwd = Path.cwd()
             os.chdir(temp_dir)
 
@@ -417,21 +457,12 @@ ccproxy:
             finally:
                 os.chdir(original_cwd)
 
-        clear_config_instance()
-
 
 class TestThreadSafety:
     """Tests for thread-safe configuration access."""
 
     def test_concurrent_get_config(self) -> None:
         """Test that concurrent access to get_config is thread-safe."""
-        import concurrent.futures
-        import os
-        import threading
-
-        # Clear any existing instance
-        clear_config_instance()
-
         yaml_content = """
 ccproxy:
   debug: true
@@ -468,4 +499,192 @@ ccproxy:
                 assert len(config_ids) == 1
             finally:
                 os.chdir(original_cwd)
-                clear_config_instance()
+
+
+class TestOAuthCredentialLoading:
+    """Tests for loading OAuth tokens from oat_sources commands."""
+
+    def test_echo_literal_loaded_without_shell(self) -> None:
+        """Test that a plain echo token is resolved in-process."""
+        config = CCProxyConfig(oat_sources={"anthropic": "echo 'static-token-123'"})
+
+        with mock.patch("ccproxy.config.subprocess.run") as mock_run:
+            config._load_credentials()
+
+        mock_run.assert_not_called()
+        assert config.get_oauth_token("anthropic") == "static-token-123"
+
+    def test_cat_file_read_without_shell(self, tmp_path: Path) -> None:
+        """Test that a plain cat of a token file is read in-process."""
+        token_file = tmp_path / "token"
+        token_file.write_text("file-token-456\n")
+        config = CCProxyConfig(oat_sources={"anthropic": f"cat {token_file}"})
+
+        with mock.patch("ccproxy.config.subprocess.run") as mock_run:
+            config._load_credentials()
+
+        mock_run.assert_not_called()
+        assert config.get_oauth_token("anthropic") == "file-token-456"
+
+    def test_cat_home_relative_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a leading ~/ in a cat path expands to the home directory like the shell would."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        (tmp_path / ".token").write_text("home-token-789")
+        config = CCProxyConfig(oat_sources={"anthropic": "cat ~/.token"})
+
+        with mock.patch("ccproxy.config.subprocess.run") as mock_run:
+            config._load_credentials()
+
+        mock_run.assert_not_called()
+        assert config.get_oauth_token("anthropic") == "home-token-789"
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            pytest.param("echo -n token", id="flag-n"),
+            pytest.param("echo -e token", id="flag-e"),
+            pytest.param("echo $TOKEN", id="dollar"),
+            pytest.param("echo `cat token`", id="backtick"),
+            pytest.param("echo token; id", id="semicolon"),
+            pytest.param("echo token | tr a-z A-Z", id="pipe"),
+            pytest.param("echo token > out", id="redirect"),
+            pytest.param("echo tok*", id="glob-star"),
+            pytest.param("echo tok?n", id="glob-question"),
+            pytest.param("echo tok[e]n", id="glob-bracket"),
+            pytest.param("echo 'token", id="unbalanced-quote"),
+            pytest.param("echo", id="no-argument"),
+            pytest.param("printf token", id="not-echo"),
+        ],
+    )
+    def test_echo_needing_shell_is_executed(self, command: str) -> None:
+        """Test that echo commands with flags, shell syntax or bad quoting are left to the shell."""
+        config = CCProxyConfig(oat_sources={"anthropic": command})
+        completed = subprocess.CompletedProcess(command, 0, stdout="shell-token\n", stderr="")
+
+        with mock.patch("ccproxy.config.subprocess.run", return_value=completed) as mock_run:
+            config._load_credentials()
+
+        assert _parse_echo_literal(command) is None
+        mock_run.assert_called_once()
+        assert mock_run.call_args.args == (command,)
+        assert config.get_oauth_token("anthropic") == "shell-token"
+
+    def test_failing_command_is_skipped(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that a non-zero exit is logged and the remaining providers still load."""
+        config = CCProxyConfig(oat_sources={"anthropic": "echo static-token", "openai": "exit 3"})
+
+        config._load_credentials()
+
+        assert config.oat_values == {"anthropic": "static-token"}
+        assert "OAuth command for provider 'openai' failed with exit code 3" in caplog.text
+
+    def test_timed_out_command_is_reported(self) -> None:
+        """Test that a command exceeding the timeout surfaces as a load failure."""
+        config = CCProxyConfig(oat_sources={"anthropic": "sleep 60"})
+
+        with (
+            mock.patch("ccproxy.config.subprocess.run", side_effect=subprocess.TimeoutExpired("sleep 60", 5)),
+            pytest.raises(RuntimeError, match="provider 'anthropic' timed out after 5 seconds"),
+        ):
+            config._load_credentials()
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            pytest.param("cat ~other/token", id="other-user-home"),
+            pytest.param("cat '~/token'", id="quoted-tilde"),
+            pytest.param("cat ~/tok~en", id="second-tilde"),
+            pytest.param("cat token other-token", id="multiple-files"),
+            pytest.param("cat -A token", id="option"),
+            pytest.param("cat $HOME/token", id="variable"),
+            pytest.param("cat 'token", id="unbalanced-quote"),
+            pytest.param("cat", id="no-argument"),
+        ],
+    )
+    def test_cat_needing_shell_is_executed(self, command: str) -> None:
+        """Test that cat commands the shell would interpret differently are not read in-process."""
+        config = CCProxyConfig(oat_sources={"anthropic": command})
+        completed = subprocess.CompletedProcess(command, 0, stdout="shell-token\n", stderr="")
+
+        with mock.patch("ccproxy.config.subprocess.run", return_value=completed) as mock_run:
+            config._load_credentials()
+
+        assert _parse_cat_path(command) is None
+        mock_run.assert_called_once()
+        assert mock_run.call_args.args == (command,)
+        assert config.get_oauth_token("anthropic") == "shell-token"
+
+    @pytest.mark.parametrize(
+        ("target", "reason"),
+        [
+            pytest.param("missing", "No such file or directory", id="missing"),
+            pytest.param(".", "Is a directory", id="directory"),
+        ],
+    )
+    def test_unreadable_cat_file_is_skipped(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture, target: str, reason: str
+    ) -> None:
+        """Test that a cat source whose file cannot be read is logged and skipped like a failing command."""
+        path = tmp_path / target
+        config = CCProxyConfig(oat_sources={"anthropic": "echo static-token", "openai": f"cat {path}"})
+
+        with mock.patch("ccproxy.config.subprocess.run") as mock_run:
+            config._load_credentials()
+
+        mock_run.assert_not_called()
+        assert config.oat_values == {"anthropic": "static-token"}
+        assert f"OAuth command for provider 'openai' could not read {path}: {reason}" in caplog.text
+
+    def test_shell_command_still_executed(self) -> None:
+        """Test that commands needing a shell are still run through it."""
+        config = CCProxyConfig(oat_sources={"anthropic": "echo shell-token | tr a-z A-Z"})
+
+        config._load_credentials()
+
+        assert config.get_oauth_token("anthropic") == "SHELL-TOKEN"
+
+    def test_shell_commands_run_concurrently(self) -> None:
+        """Test that shell-based sources are started together rather than one after another."""
+        started = threading.Barrier(2, timeout=5)
+
+        def fake_run(command: str, **kwargs: object) -> subprocess.CompletedProcess[str]:
+            # Both commands must be in flight at once to get past the barrier
+            started.wait()
+            return subprocess.CompletedProcess(command, 0, stdout=command.split()[-1], stderr="")
+
+        config = CCProxyConfig(
+            oat_sources={
+                "anthropic": "cat ~/.tokens | grep anthropic-token",
+                "openai": "cat ~/.tokens | grep openai-token",
+            }
+        )
+
+        with mock.patch("ccproxy.config.subprocess.run", side_effect=fake_run):
+            config._load_credentials()
+
+        assert config.oat_values == {"anthropic": "anthropic-token", "openai": "openai-token"}
+
+    def test_single_shell_command_runs_inline(self) -> None:
+        """Test that one shell-based source does not pay for a thread pool."""
+        config = CCProxyConfig(oat_sources={"anthropic": "echo shell-token | tr a-z A-Z"})
+
+        with mock.patch("ccproxy.config.ThreadPoolExecutor") as mock_pool:
+            config._load_credentials()
+
+        mock_pool.assert_not_called()
+        assert config.get_oauth_token("anthropic") == "SHELL-TOKEN"
+
+    def test_shell_command_pool_is_bounded(self) -> None:
+        """Test that many shell-based sources share a capped number of worker threads."""
+        providers = [f"provider-{i}" for i in range(_OAUTH_COMMAND_MAX_WORKERS * 2)]
+        config = CCProxyConfig(oat_sources={name: f"echo {name} | cat" for name in providers})
+        completed = subprocess.CompletedProcess("", 0, stdout="token", stderr="")
+
+        with (
+            mock.patch("ccproxy.config.ThreadPoolExecutor", wraps=concurrent.futures.ThreadPoolExecutor) as mock_pool,
+            mock.patch("ccproxy.config.subprocess.run", return_value=completed),
+        ):
+            config._load_credentials()
+
+        mock_pool.assert_called_once_with(max_workers=_OAUTH_COMMAND_MAX_WORKERS)
+        assert config.oat_values == dict.fromkeys(providers, "token")
@@ -1,7 +1,7 @@
 """Tests demonstrating classifier extensibility."""
 
 from ccproxy.classifier import RequestClassifier
-from ccproxy.config import CCProxyConfig
+from ccproxy.config import CCProxyConfig, RuleConfig, set_config_instance
 from ccproxy.rules import ClassificationRule
 
 
@@ -133,8 +133,6 @@ class TestClassifierExtensibility:
     def test_reset_to_default_rules(self) -> None:
         """Test resetting to default rules after customization."""
 
-        from ccproxy.config import CCProxyConfig, RuleConfig, clear_config_instance, set_config_instance
-
         # Create test config with token_count rule
         test_config = CCProxyConfig()
         test_config.rules = [
@@ -142,37 +140,31 @@ class TestClassifierExtensibility:
         ]
 
         # Set the test config
-        clear_config_instance()
         set_config_instance(test_config)
 
-        try:
-            classifier = RequestClassifier()
+        classifier = RequestClassifier()
 
-            # Add custom rule
-            classifier.add_rule("background", CustomHeaderRule())
+        # Add custom rule
+        classifier.add_rule("background", CustomHeaderRule())
 
-            # Clear and add only custom
-            classifier._clear_rules()
-            classifier.add_rule("background", CustomHeaderRule())
+        # Clear and add only custom
+        classifier._clear_rules()
+        classifier.add_rule("background", CustomHeaderRule())
 
-            # Verify default rules don't work
-            request = {"token_count": 100000}
-            model_name = classifier.classify(request)
-            assert model_name == "default"
+        # Verify default rules don't work
+        request = {"token_count": 100000}
+        model_name = classifier.classify(request)
+        assert model_name == "default"
 
-            # Reset to defaults
-            classifier._setup_rules()
+        # Reset to defaults
+        classifier._setup_rules()
 
-            # Now default rules work again
-            model_name = classifier.classify(request)
-            assert model_name == "token_count"
-        finally:
-            clear_config_instance()
+        # Now default rules work again
+        model_name = classifier.classify(request)
+        assert model_name == "token_count"
 
     def test_mixed_default_and_custom_rules(self) -> None:
         """Test using both default and custom rules together."""
-        from ccproxy.config import CCProxyConfig, RuleConfig, clear_config_instance, set_config_instance
-
         # Create test config with token_count rule
         test_config = CCProxyConfig()
         test_config.rules = [
@@ -180,29 +172,25 @@ class TestClassifierExtensibility:
         ]
 
         # Set the test config
-        clear_config_instance()
         set_config_instance(test_config)
 
-        try:
-            classifier = RequestClassifier()
-
-            # Add custom rule on top of defaults
-            classifier.add_rule("production", CustomEnvironmentRule("production"))
-
-            # Test default rule (token count)
-            request = {"token_count": 100000}
-            model_name = classifier.classify(request)
-            assert model_name == "token_count"
-
-            # Test custom rule
-            request = {
-                "model": "claude-sonnet-4-5-20250929",
-                "metadata": {"environment": "production"},
-            }
-            model_name = classifier.classify(request)
-            assert model_name == "production"
-        finally:
-            clear_config_instance()
+        classifier = RequestClassifier()
+
+        # Add custom rule on top of defaults
+        classifier.add_rule("production", CustomEnvironmentRule("production"))
+
+        # Test default rule (token count)
+        request = {"token_count": 100000}
+        model_name = classifier.classify(request)
+        assert model_name == "token_count"
+
+        # Test custom rule
+        request = {
+            "model": "claude-sonnet-4-5-20250929",
+            "metadata": {"environment": "production"},
+        }
+        model_name = classifier.classify(request)
+        assert model_name == "production"
 
     def test_custom_rule_edge_cases(self) -> None:
         """Test edge cases with custom rules."""
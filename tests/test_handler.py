@@ -2,14 +2,26 @@
 
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 import yaml
 
-from ccproxy.config import CCProxyConfig, RuleConfig, clear_config_instance, set_config_instance
+from ccproxy.config import CCProxyConfig, RuleConfig, set_config_instance
 from ccproxy.handler import CCProxyHandler
-from ccproxy.router import ModelRouter, clear_router
+from ccproxy.router import ModelRouter
+
+
+@pytest.fixture
+def no_global_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fail the test if the handler or classifier falls back to the global config."""
+
+    def _fail() -> CCProxyConfig:
+        raise AssertionError("get_config() called despite an injected config")
+
+    monkeypatch.setattr("ccproxy.handler.get_config", _fail)
+    monkeypatch.setattr("ccproxy.classifier.get_config", _fail)
 
 
 class TestCCProxyRouting:
@@ -17,18 +29,15 @@ class TestCCProxyRouting:
 
     def _create_router_with_models(self, model_list: list) -> ModelRouter:
         """Helper to create a router with mocked models."""
-        mock_config = MagicMock(spec=CCProxyConfig)
+        mock_config = MagicMock()
 
         mock_proxy_server = MagicMock()
         mock_proxy_server.llm_router = MagicMock()
         mock_proxy_server.llm_router.model_list = model_list
 
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
-
         with (
             patch("ccproxy.router.get_config", return_value=mock_config),
-            patch.dict("sys.modules", {"litellm.proxy": mock_module}),
+            patch("litellm.proxy.proxy_server", mock_proxy_server),
         ):
             return ModelRouter()
 
@@ -119,7 +128,7 @@ class TestCCProxyRouting:
         litellm_path.unlink()
         ccproxy_path.unlink()
 
-    async def test_route_to_default(self, config_files):
+    async def test_route_to_default(self, config_files, patch_litellm_proxy):
         """Test routing simple request to default model."""
         ccproxy_path, litellm_path = config_files
 
@@ -151,29 +160,18 @@ class TestCCProxyRouting:
             },
         ]
 
-        mock_proxy_server = MagicMock()
-        mock_proxy_server.llm_router = MagicMock()
-        mock_proxy_server.llm_router.model_list = test_model_list
-
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
-
-        try:
-            with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-                handler = CCProxyHandler()
-                request_data = {
-                    "model": "claude-sonnet-4-5-20250929",
-                    "messages": [{"role": "user", "content": "Hello"}],
-                }
-                user_api_key_dict = {}
+        with patch_litellm_proxy(test_model_list):
+            handler = CCProxyHandler()
+            request_data = {
+                "model": "claude-sonnet-4-5-20250929",
+                "messages": [{"role": "user", "content": "Hello"}],
+            }
+            user_api_key_dict = {}
 
-                result = await handler.async_pre_call_hook(request_data, user_api_key_dict)
-                assert result["model"] == "claude-sonnet-4-5-20250929"
-        finally:
-            clear_config_instance()
-            clear_router()
+            result = await handler.async_pre_call_hook(request_data, user_api_key_dict)
+            assert result["model"] == "claude-sonnet-4-5-20250929"
 
-    async def test_route_to_background(self, config_files):
+    async def test_route_to_background(self, config_files, patch_litellm_proxy):
         """Test routing haiku model to background."""
         ccproxy_path, litellm_path = config_files
 
@@ -204,27 +202,16 @@ class TestCCProxyRouting:
             },
         ]
 
-        mock_proxy_server = MagicMock()
-        mock_proxy_server.llm_router = MagicMock()
-        mock_proxy_server.llm_router.model_list = test_model_list
-
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
-
-        try:
-            with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-                handler = CCProxyHandler()
-                request_data = {
-                    "model": "claude-haiku-4-5-20251001-20241022",
-                    "messages": [{"role": "user", "content": "Format this code"}],
-                }
-                user_api_key_dict = {}
+        with patch_litellm_proxy(test_model_list):
+            handler = CCProxyHandler()
+            request_data = {
+                "model": "claude-haiku-4-5-20251001-20241022",
+                "messages": [{"role": "user", "content": "Format this code"}],
+            }
+            user_api_key_dict = {}
 
-                result = await handler.async_pre_call_hook(request_data, user_api_key_dict)
-                assert result["model"] == "claude-haiku-4-5-20251001-20241022"
-        finally:
-            clear_config_instance()
-            clear_router()
+            result = await handler.async_pre_call_hook(request_data, user_api_key_dict)
+            assert result["model"] == "claude-haiku-4-5-20251001-20241022"
 
 
 class TestHandlerHookMethods:
@@ -285,7 +272,7 @@ class TestHandlerHookMethods:
         ccproxy_path.unlink()
 
     @pytest.fixture
-    def handler(self) -> CCProxyHandler:
+    def handler(self, patch_litellm_proxy) -> CCProxyHandler:
         """Create a ccproxy handler instance with mocked router."""
         # Create a minimal config with hooks
         config = CCProxyConfig(
@@ -299,26 +286,16 @@ class TestHandlerHookMethods:
         set_config_instance(config)
 
         # Mock proxy server with default model
-        mock_proxy_server = MagicMock()
-        mock_proxy_server.llm_router = MagicMock()
-        mock_proxy_server.llm_router.model_list = [
+        model_list = [
             {
                 "model_name": "default",
                 "litellm_params": {"model": "claude-sonnet-4-5-20250929"},
             },
         ]
 
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
-
-        try:
-            with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-                clear_router()  # Clear any existing router
-                handler = CCProxyHandler()
-                yield handler
-        finally:
-            clear_config_instance()
-            clear_router()
+        # The autouse cleanup fixture resets the config/router singletons afterwards
+        with patch_litellm_proxy(model_list):
+            yield CCProxyHandler()
 
     @pytest.mark.asyncio
     async def test_log_success_hook(self, handler: CCProxyHandler) -> None:
@@ -329,7 +306,9 @@ class TestHandlerHookMethods:
             "end_time": 1234567900,
             "cache_hit": False,
         }
-        response_obj = Mock(model="test-model", usage=Mock(completion_tokens=10, prompt_tokens=20, total_tokens=30))
+        response_obj = SimpleNamespace(
+            model="test-model", usage=SimpleNamespace(completion_tokens=10, prompt_tokens=20, total_tokens=30)
+        )
 
         # Should not raise any exceptions
         await handler.async_log_success_event(kwargs, response_obj, 1234567890, 1234567900)
@@ -420,7 +399,7 @@ class TestCCProxyHandler:
     """Tests for ccproxy handler class."""
 
     @pytest.fixture
-    def handler(self, config_files):
+    def handler(self, config_files, patch_litellm_proxy):
         """Create handler with test config."""
         ccproxy_path, litellm_path = config_files
 
@@ -439,30 +418,10 @@ class TestCCProxyHandler:
             },
         ]
 
-        mock_proxy_server = MagicMock()
-        mock_proxy_server.llm_router = MagicMock()
-        mock_proxy_server.llm_router.model_list = test_model_list
-
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
-
         # We need to patch the proxy_server import for the handler's initialization
         # This will ensure the router gets the mocked model list
-        import sys
-
-        original_module = sys.modules.get("litellm.proxy")
-        sys.modules["litellm.proxy"] = mock_module
-
-        try:
-            handler = CCProxyHandler()
-            yield handler
-        finally:
-            if original_module is None:
-                sys.modules.pop("litellm.proxy", None)
-            else:
-                sys.modules["litellm.proxy"] = original_module
-            clear_config_instance()
-            clear_router()
+        with patch_litellm_proxy(test_model_list):
+            yield CCProxyHandler()
 
     @pytest.fixture
     def config_files(self):
@@ -564,7 +523,7 @@ class TestCCProxyHandler:
         assert modified_data["metadata"]["ccproxy_model_name"] == "default"
         assert modified_data["metadata"]["ccproxy_alias_model"] == "claude-sonnet-4-5-20250929"
 
-    async def test_handler_uses_config_threshold(self):
+    async def test_handler_uses_config_threshold(self, patch_litellm_proxy):
         """Test that handler uses context threshold from config."""
         # Create config with custom threshold
         ccproxy_data = {
@@ -615,14 +574,7 @@ class TestCCProxyHandler:
                 },
             ]
 
-            mock_proxy_server = MagicMock()
-            mock_proxy_server.llm_router = MagicMock()
-            mock_proxy_server.llm_router.model_list = test_model_list
-
-            mock_module = MagicMock()
-            mock_module.proxy_server = mock_proxy_server
-
-            with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
+            with patch_litellm_proxy(test_model_list):
                 handler = CCProxyHandler()
 
                 # Create request with >10k tokens using varied text
@@ -647,11 +599,9 @@ class TestCCProxyHandler:
         finally:
             ccproxy_path.unlink()
             litellm_path.unlink()
-            clear_config_instance()
-            clear_router()
 
     @pytest.mark.asyncio
-    async def test_hooks_loaded_from_config(self) -> None:
+    async def test_hooks_loaded_from_config(self, patch_litellm_proxy) -> None:
         """Test that hooks are loaded from configuration file."""
         # Create config with hooks
         ccproxy_data = {
@@ -681,14 +631,7 @@ class TestCCProxyHandler:
             set_config_instance(config)
 
             # Mock proxy server
-            mock_proxy_server = MagicMock()
-            mock_proxy_server.llm_router = MagicMock()
-            mock_proxy_server.llm_router.model_list = []
-
-            mock_module = MagicMock()
-            mock_module.proxy_server = mock_proxy_server
-
-            with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
+            with patch_litellm_proxy([]):
                 handler = CCProxyHandler()
 
                 # Verify hooks were loaded
@@ -699,11 +642,9 @@ class TestCCProxyHandler:
         finally:
             ccproxy_path.unlink()
             litellm_path.unlink()
-            clear_config_instance()
-            clear_router()
 
     @pytest.mark.asyncio
-    async def test_no_default_model_fallback(self) -> None:
+    async def test_no_default_model_fallback(self, patch_litellm_proxy) -> None:
         """Test that handler continues processing when no 'default' label is configured."""
         # Create config without a 'default' model
         ccproxy_config = CCProxyConfig(
@@ -719,95 +660,81 @@ class TestCCProxyHandler:
         set_config_instance(ccproxy_config)
 
         # Mock proxy server with only token_count model (no default)
-        mock_proxy_server = MagicMock()
-        mock_proxy_server.llm_router = MagicMock()
-        mock_proxy_server.llm_router.model_list = [
+        model_list = [
             {
                 "model_name": "token_count",
                 "litellm_params": {"model": "gemini-2.5-pro"},
             },
         ]
 
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
-
-        try:
-            with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-                clear_router()  # Clear router to force reload
-                handler = CCProxyHandler()
-
-                # Test with request that doesn't match any rule
-                request_data = {
-                    "model": "claude-opus-4-5-20251101",
-                    "messages": [{"role": "user", "content": "Hello"}],
-                    "token_count": 100,  # Below threshold
-                }
-                user_api_key_dict = {}
+        with patch_litellm_proxy(model_list):
+            handler = CCProxyHandler()
 
-                # Should log error but continue processing
-                result = await handler.async_pre_call_hook(request_data, user_api_key_dict)
+            # Test with request that doesn't match any rule
+            request_data = {
+                "model": "claude-opus-4-5-20251101",
+                "messages": [{"role": "user", "content": "Hello"}],
+                "token_count": 100,  # Below threshold
+            }
+            user_api_key_dict = {}
 
-                # Verify request continues with original model
-                assert result["model"] == "claude-opus-4-5-20251101"
+            # Should log error but continue processing
+            result = await handler.async_pre_call_hook(request_data, user_api_key_dict)
 
-                # Test with missing model field
-                request_data_no_model = {
-                    "messages": [{"role": "user", "content": "Hello"}],
-                    "token_count": 100,  # Below threshold
-                }
+            # Verify request continues with original model
+            assert result["model"] == "claude-opus-4-5-20251101"
 
-                # Should log error but continue processing
-                await handler.async_pre_call_hook(request_data_no_model, user_api_key_dict)
+            # Test with missing model field
+            request_data_no_model = {
+                "messages": [{"role": "user", "content": "Hello"}],
+                "token_count": 100,  # Below threshold
+            }
 
-        finally:
-            clear_config_instance()
-            clear_router()
+            # Should log error but continue processing
+            await handler.async_pre_call_hook(request_data_no_model, user_api_key_dict)
 
     @pytest.mark.asyncio
-    async def test_log_routing_decision_fallback_scenario(self) -> None:
+    async def test_log_routing_decision_fallback_scenario(self, no_global_config: None) -> None:
         """Test _log_routing_decision with fallback scenario (lines 135-136)."""
-        # Set up handler with debug mode
-        config = CCProxyConfig(debug=True)
-        clear_config_instance()
-        set_config_instance(config)
-
-        try:
-            handler = CCProxyHandler()
-
-            # Test fallback scenario where model_config is None
-            # This tests lines 135-136: color = "yellow", routing_type = "FALLBACK"
-            handler._log_routing_decision(
-                model_name="default",
-                original_model="gpt-4",
-                routed_model="claude-sonnet-4-5-20250929",
-                model_config=None,  # This triggers the fallback path
-            )
-
-        finally:
-            clear_config_instance()
-            clear_router()
+        # Inject a debug config; no_global_config guarantees ~/.ccproxy is never read
+        handler = CCProxyHandler(config=CCProxyConfig(debug=True))
+
+        # Test fallback scenario where model_config is None
+        # This tests lines 135-136: color = "yellow", routing_type = "FALLBACK"
+        handler._log_routing_decision(
+            model_name="default",
+            original_model="gpt-4",
+            routed_model="claude-sonnet-4-5-20250929",
+            model_config=None,  # This triggers the fallback path
+        )
 
     @pytest.mark.asyncio
-    async def test_log_routing_decision_passthrough_scenario(self) -> None:
+    async def test_log_routing_decision_passthrough_scenario(self, no_global_config: None) -> None:
         """Test _log_routing_decision with passthrough scenario (lines 139-140)."""
-        # Set up handler with debug mode
-        config = CCProxyConfig(debug=True)
-        clear_config_instance()
-        set_config_instance(config)
-
-        try:
-            handler = CCProxyHandler()
+        # Inject a debug config; no_global_config guarantees ~/.ccproxy is never read
+        handler = CCProxyHandler(config=CCProxyConfig(debug=True))
+
+        # Test passthrough scenario where original_model == routed_model
+        # This tests lines 139-140: color = "dim", routing_type = "PASSTHROUGH"
+        model_config = {"model_info": {"some": "config"}}
+        handler._log_routing_decision(
+            model_name="default",
+            original_model="claude-sonnet-4-5-20250929",
+            routed_model="claude-sonnet-4-5-20250929",  # Same as original = passthrough
+            model_config=model_config,
+        )
 
-            # Test passthrough scenario where original_model == routed_model
-            # This tests lines 139-140: color = "dim", routing_type = "PASSTHROUGH"
-            model_config = {"model_info": {"some": "config"}}
-            handler._log_routing_decision(
-                model_name="default",
-                original_model="claude-sonnet-4-5-20250929",
-                routed_model="claude-sonnet-4-5-20250929",  # Same as original = passthrough
-                model_config=model_config,
-            )
+    def test_injected_config_reaches_classifier(self, no_global_config: None) -> None:
+        """Test the injected config drives classification without touching the global instance."""
+        config = CCProxyConfig(
+            rules=[
+                RuleConfig(
+                    name="background",
+                    rule_path="ccproxy.rules.MatchModelRule",
+                    params=[{"model_name": "claude-3-5-haiku"}],
+                ),
+            ],
+        )
+        handler = CCProxyHandler(config=config)
 
-        finally:
-            clear_config_instance()
-            clear_router()
+        assert handler.classifier.classify({"model": "claude-3-5-haiku", "messages": []}) == "background"
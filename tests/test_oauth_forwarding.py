@@ -1,60 +1,50 @@
 """Test OAuth token forwarding for Claude CLI requests."""
 
-from unittest.mock import MagicMock, patch
-
 import pytest
 
-from ccproxy.config import clear_config_instance
+from ccproxy.config import CCProxyConfig, set_config_instance
 from ccproxy.handler import CCProxyHandler
-from ccproxy.router import clear_router
-
 
-@pytest.fixture
-def mock_handler():
-    """Create a ccproxy handler with mocked router that provides a default model."""
-    # Mock proxy server with default model
-    mock_proxy_server = MagicMock()
-    mock_proxy_server.llm_router = MagicMock()
-    mock_proxy_server.llm_router.model_list = [
-        {
-            "model_name": "default",
-            "litellm_params": {
-                "model": "claude-sonnet-4-5-20250929",
-                "api_base": "https://api.anthropic.com",
-            },
-        },
-        {
-            "model_name": "background",
-            "litellm_params": {
-                "model": "claude-haiku-4-5-20251001-20241022",
-                "api_base": "https://api.anthropic.com",
-            },
-        },
-    ]
 
-    mock_module = MagicMock()
-    mock_module.proxy_server = mock_proxy_server
+@pytest.fixture(scope="module")
+def routing_config():
+    """Config with the routing and OAuth forwarding hooks, built once per module.
 
-    # Set up config with hooks
-    from ccproxy.config import CCProxyConfig, set_config_instance
-
-    config = CCProxyConfig(
+    No oat_sources are configured, so the config is never mutated by the tests.
+    """
+    return CCProxyConfig(
         debug=False,
         default_model_passthrough=False,  # Disable passthrough to test actual routing
         hooks=["ccproxy.hooks.rule_evaluator", "ccproxy.hooks.model_router", "ccproxy.hooks.forward_oauth"],
         rules=[],
     )
-    set_config_instance(config)
 
-    # Patch the proxy server import
-    with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-        clear_router()  # Clear any existing router
-        handler = CCProxyHandler()  # Create actual handler instance
-        yield handler
 
-    # Cleanup
-    clear_config_instance()
-    clear_router()
+@pytest.fixture
+def mock_handler(routing_config, patch_litellm_proxy):
+    """Create a ccproxy handler with mocked router that provides a default model."""
+    set_config_instance(routing_config)
+
+    # Patch the proxy server import; the autouse cleanup fixture resets the singletons afterwards
+    with patch_litellm_proxy(
+        [
+            {
+                "model_name": "default",
+                "litellm_params": {
+                    "model": "claude-sonnet-4-5-20250929",
+                    "api_base": "https://api.anthropic.com",
+                },
+            },
+            {
+                "model_name": "background",
+                "litellm_params": {
+                    "model": "claude-haiku-4-5-20251001-20241022",
+                    "api_base": "https://api.anthropic.com",
+                },
+            },
+        ]
+    ):
+        yield CCProxyHandler()  # Create actual handler instance
 
 
 @pytest.mark.asyncio
@@ -193,37 +183,22 @@ async def test_oauth_forwarding_with_routed_model(mock_handler):
 
 
 @pytest.mark.asyncio
-async def test_oauth_forwarding_for_anthropic_direct_api():
+async def test_oauth_forwarding_for_anthropic_direct_api(routing_config, patch_litellm_proxy):
     """Test that OAuth tokens ARE forwarded for models going to Anthropic's API directly."""
+    set_config_instance(routing_config)
+
     # Create a handler with Anthropic model going to Anthropic's API
-    mock_proxy_server = MagicMock()
-    mock_proxy_server.llm_router = MagicMock()
-    mock_proxy_server.llm_router.model_list = [
-        {
-            "model_name": "default",
-            "litellm_params": {
-                "model": "anthropic/claude-sonnet-4-5-20250929",
-                "api_base": "https://api.anthropic.com",
+    with patch_litellm_proxy(
+        [
+            {
+                "model_name": "default",
+                "litellm_params": {
+                    "model": "anthropic/claude-sonnet-4-5-20250929",
+                    "api_base": "https://api.anthropic.com",
+                },
             },
-        },
-    ]
-
-    mock_module = MagicMock()
-    mock_module.proxy_server = mock_proxy_server
-
-    # Set up config with hooks
-    from ccproxy.config import CCProxyConfig, set_config_instance
-
-    config = CCProxyConfig(
-        debug=False,
-        default_model_passthrough=False,  # Disable passthrough to test actual routing
-        hooks=["ccproxy.hooks.rule_evaluator", "ccproxy.hooks.model_router", "ccproxy.hooks.forward_oauth"],
-        rules=[],
-    )
-    set_config_instance(config)
-
-    with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-        clear_router()
+        ]
+    ):
         handler = CCProxyHandler()
 
         # Test data from claude-cli
@@ -249,6 +224,3 @@ async def test_oauth_forwarding_for_anthropic_direct_api():
 
         # Verify the model was routed correctly
         assert result["model"] == "anthropic/claude-sonnet-4-5-20250929"
-
-    clear_config_instance()
-    clear_router()
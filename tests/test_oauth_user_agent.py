@@ -1,14 +1,13 @@
 """Tests for custom User-Agent support in OAuth token sources."""
 
-import tempfile
-from pathlib import Path
-from unittest.mock import MagicMock, patch
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack
+from typing import Any
 
 import pytest
 
-from ccproxy.config import CCProxyConfig, OAuthSource, clear_config_instance
+from ccproxy.config import CCProxyConfig, OAuthSource, set_config_instance
 from ccproxy.handler import CCProxyHandler
-from ccproxy.router import clear_router
 
 
 class TestOAuthSource:
@@ -37,20 +36,12 @@ ccproxy:
   oat_sources:
     anthropic: echo 'anthropic-token-123'
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
+        config = CCProxyConfig.from_yaml_string(yaml_content)
 
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
-
-            # Token should be loaded
-            assert config.get_oauth_token("anthropic") == "anthropic-token-123"
-            # No user-agent should be configured
-            assert config.get_oauth_user_agent("anthropic") is None
-
-        finally:
-            yaml_path.unlink()
+        # Token should be loaded
+        assert config.get_oauth_token("anthropic") == "anthropic-token-123"
+        # No user-agent should be configured
+        assert config.get_oauth_user_agent("anthropic") is None
 
     def test_extended_format_with_user_agent(self) -> None:
         """Test loading OAuth source with custom user_agent."""
@@ -61,20 +52,12 @@ ccproxy:
       command: echo 'vertex-ai-token-456'
       user_agent: MyApp/1.0.0
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
-
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
-
-            # Token should be loaded
-            assert config.get_oauth_token("vertex_ai") == "vertex-ai-token-456"
-            # User-agent should be configured
-            assert config.get_oauth_user_agent("vertex_ai") == "MyApp/1.0.0"
+        config = CCProxyConfig.from_yaml_string(yaml_content)
 
-        finally:
-            yaml_path.unlink()
+        # Token should be loaded
+        assert config.get_oauth_token("vertex_ai") == "vertex-ai-token-456"
+        # User-agent should be configured
+        assert config.get_oauth_user_agent("vertex_ai") == "MyApp/1.0.0"
 
     def test_mixed_format_sources(self) -> None:
         """Test mixing string and extended formats in same config."""
@@ -87,25 +70,17 @@ ccproxy:
       user_agent: VertexAIClient/2.1.0
     openai: echo 'openai-token-789'
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
+        config = CCProxyConfig.from_yaml_string(yaml_content)
 
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
+        # All tokens should be loaded
+        assert config.get_oauth_token("anthropic") == "anthropic-token-123"
+        assert config.get_oauth_token("vertex_ai") == "vertex-ai-token-456"
+        assert config.get_oauth_token("openai") == "openai-token-789"
 
-            # All tokens should be loaded
-            assert config.get_oauth_token("anthropic") == "anthropic-token-123"
-            assert config.get_oauth_token("vertex_ai") == "vertex-ai-token-456"
-            assert config.get_oauth_token("openai") == "openai-token-789"
-
-            # Only gemini should have user-agent
-            assert config.get_oauth_user_agent("anthropic") is None
-            assert config.get_oauth_user_agent("vertex_ai") == "VertexAIClient/2.1.0"
-            assert config.get_oauth_user_agent("openai") is None
-
-        finally:
-            yaml_path.unlink()
+        # Only gemini should have user-agent
+        assert config.get_oauth_user_agent("anthropic") is None
+        assert config.get_oauth_user_agent("vertex_ai") == "VertexAIClient/2.1.0"
+        assert config.get_oauth_user_agent("openai") is None
 
     def test_extended_format_without_user_agent(self) -> None:
         """Test extended format with only command field."""
@@ -115,20 +90,12 @@ ccproxy:
     vertex_ai:
       command: echo 'vertex-ai-token-456'
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
-
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
+        config = CCProxyConfig.from_yaml_string(yaml_content)
 
-            # Token should be loaded
-            assert config.get_oauth_token("vertex_ai") == "vertex-ai-token-456"
-            # No user-agent
-            assert config.get_oauth_user_agent("vertex_ai") is None
-
-        finally:
-            yaml_path.unlink()
+        # Token should be loaded
+        assert config.get_oauth_token("vertex_ai") == "vertex-ai-token-456"
+        # No user-agent
+        assert config.get_oauth_user_agent("vertex_ai") is None
 
     def test_user_agent_cached_during_load(self) -> None:
         """Test that user-agent is cached when credentials are loaded."""
@@ -142,21 +109,13 @@ ccproxy:
       command: echo 'token-2'
       user_agent: Provider2Client/2.0
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
-
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
-
-            # Check internal _oat_user_agents cache
-            assert config._oat_user_agents == {
-                "provider1": "Provider1Client/1.0",
-                "provider2": "Provider2Client/2.0",
-            }
+        config = CCProxyConfig.from_yaml_string(yaml_content)
 
-        finally:
-            yaml_path.unlink()
+        # Check internal _oat_user_agents cache
+        assert config._oat_user_agents == {
+            "provider1": "Provider1Client/1.0",
+            "provider2": "Provider2Client/2.0",
+        }
 
     def test_get_oauth_user_agent_nonexistent_provider(self) -> None:
         """Test getting user-agent for non-configured provider."""
@@ -164,29 +123,16 @@ ccproxy:
         assert config.get_oauth_user_agent("nonexistent") is None
 
 
-class TestOAuthUserAgentForwarding:
-    """Tests for User-Agent header forwarding in forward_oauth hook."""
-
-    @pytest.mark.asyncio
-    async def test_custom_user_agent_forwarded(self) -> None:
-        """Test that custom user-agent is forwarded in request."""
-        # Set up mock proxy server
-        mock_proxy_server = MagicMock()
-        mock_proxy_server.llm_router = MagicMock()
-        mock_proxy_server.llm_router.model_list = [
-            {
-                "model_name": "default",
-                "litellm_params": {
-                    "model": "gemini-2.5-pro",
-                },
-            },
-        ]
-
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
+_GEMINI_MODEL_LIST = [{"model_name": "default", "litellm_params": {"model": "gemini-2.5-pro"}}]
+_ANTHROPIC_MODEL_LIST = [
+    {
+        "model_name": "default",
+        "litellm_params": {"model": "claude-sonnet-4-5-20250929", "api_base": "https://api.anthropic.com"},
+    },
+]
 
-        # Create config with gemini OAuth source that has custom user-agent
-        yaml_content = """
+# Create config with gemini OAuth source that has custom user-agent
+_VERTEX_CUSTOM_UA_YAML = """
 ccproxy:
   oat_sources:
     vertex_ai:
@@ -198,71 +144,9 @@ ccproxy:
     - ccproxy.hooks.model_router
     - ccproxy.hooks.forward_oauth
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
-
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
-            from ccproxy.config import set_config_instance
-
-            set_config_instance(config)
-
-            with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-                clear_router()
-                handler = CCProxyHandler()
-
-                # Test data for Gemini model
-                data = {
-                    "model": "gemini-2.5-pro",
-                    "messages": [{"role": "user", "content": "test"}],
-                    "metadata": {},
-                    "provider_specific_header": {"extra_headers": {}},
-                    "proxy_server_request": {"headers": {"user-agent": "original-client/1.0"}},
-                    "secret_fields": {"raw_headers": {"authorization": "Bearer vertex-ai-token-123"}},
-                }
-
-                user_api_key_dict = {}
-                kwargs = {}
-
-                # Call the hook
-                result = await handler.async_pre_call_hook(data, user_api_key_dict, **kwargs)
-
-                # Verify custom User-Agent was set
-                assert "provider_specific_header" in result
-                assert "extra_headers" in result["provider_specific_header"]
-                assert result["provider_specific_header"]["extra_headers"]["user-agent"] == "MyCustomApp/3.0.0"
-                # Authorization should also be forwarded
-                assert (
-                    result["provider_specific_header"]["extra_headers"]["authorization"] == "Bearer vertex-ai-token-123"
-                )
-
-        finally:
-            yaml_path.unlink()
-            clear_config_instance()
-            clear_router()
-
-    @pytest.mark.asyncio
-    async def test_no_user_agent_when_not_configured(self) -> None:
-        """Test that no user-agent is set when not configured for provider."""
-        # Set up mock proxy server
-        mock_proxy_server = MagicMock()
-        mock_proxy_server.llm_router = MagicMock()
-        mock_proxy_server.llm_router.model_list = [
-            {
-                "model_name": "default",
-                "litellm_params": {
-                    "model": "claude-sonnet-4-5-20250929",
-                    "api_base": "https://api.anthropic.com",
-                },
-            },
-        ]
 
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
-
-        # Create config with anthropic OAuth source WITHOUT custom user-agent
-        yaml_content = """
+# Create config with anthropic OAuth source WITHOUT custom user-agent
+_ANTHROPIC_NO_UA_YAML = """
 ccproxy:
   oat_sources:
     anthropic: echo 'anthropic-token-123'
@@ -272,71 +156,9 @@ ccproxy:
     - ccproxy.hooks.model_router
     - ccproxy.hooks.forward_oauth
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
-
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
-            from ccproxy.config import set_config_instance
-
-            set_config_instance(config)
-
-            with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-                clear_router()
-                handler = CCProxyHandler()
-
-                # Test data for Anthropic model
-                data = {
-                    "model": "claude-sonnet-4-5-20250929",
-                    "messages": [{"role": "user", "content": "test"}],
-                    "metadata": {},
-                    "provider_specific_header": {"extra_headers": {}},
-                    "proxy_server_request": {"headers": {"user-agent": "claude-cli/1.0.62"}},
-                    "secret_fields": {"raw_headers": {"authorization": "Bearer anthropic-token-123"}},
-                }
-
-                user_api_key_dict = {}
-                kwargs = {}
-
-                # Call the hook
-                result = await handler.async_pre_call_hook(data, user_api_key_dict, **kwargs)
-
-                # Verify custom User-Agent was NOT set (because not configured)
-                assert "provider_specific_header" in result
-                assert "extra_headers" in result["provider_specific_header"]
-                # user-agent should not be in extra_headers
-                assert "user-agent" not in result["provider_specific_header"]["extra_headers"]
-                # Authorization should still be forwarded
-                assert (
-                    result["provider_specific_header"]["extra_headers"]["authorization"] == "Bearer anthropic-token-123"
-                )
-
-        finally:
-            yaml_path.unlink()
-            clear_config_instance()
-            clear_router()
-
-    @pytest.mark.asyncio
-    async def test_user_agent_overrides_original(self) -> None:
-        """Test that configured user-agent overrides the original client user-agent."""
-        # Set up mock proxy server
-        mock_proxy_server = MagicMock()
-        mock_proxy_server.llm_router = MagicMock()
-        mock_proxy_server.llm_router.model_list = [
-            {
-                "model_name": "default",
-                "litellm_params": {
-                    "model": "gemini-2.5-pro",
-                },
-            },
-        ]
-
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
 
-        # Create config with gemini OAuth source with custom user-agent
-        yaml_content = """
+# Create config with gemini OAuth source with custom user-agent
+_VERTEX_OVERRIDE_UA_YAML = """
 ccproxy:
   oat_sources:
     vertex_ai:
@@ -348,74 +170,10 @@ ccproxy:
     - ccproxy.hooks.model_router
     - ccproxy.hooks.forward_oauth
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
-
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
-            from ccproxy.config import set_config_instance
-
-            set_config_instance(config)
-
-            with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-                clear_router()
-                handler = CCProxyHandler()
-
-                # Test data with original user-agent that should be overridden
-                data = {
-                    "model": "gemini-2.5-pro",
-                    "messages": [{"role": "user", "content": "test"}],
-                    "metadata": {},
-                    "provider_specific_header": {"extra_headers": {}},
-                    "proxy_server_request": {"headers": {"user-agent": "OriginalClient/9.9.9"}},
-                    "secret_fields": {"raw_headers": {"authorization": "Bearer vertex-ai-token-123"}},
-                }
-
-                user_api_key_dict = {}
-                kwargs = {}
-
-                # Call the hook
-                result = await handler.async_pre_call_hook(data, user_api_key_dict, **kwargs)
-
-                # Verify custom User-Agent overrode the original
-                assert result["provider_specific_header"]["extra_headers"]["user-agent"] == "ProxyOverride/1.0"
-                # Not the original
-                assert result["provider_specific_header"]["extra_headers"]["user-agent"] != "OriginalClient/9.9.9"
-
-        finally:
-            yaml_path.unlink()
-            clear_config_instance()
-            clear_router()
 
-    @pytest.mark.asyncio
-    async def test_multiple_providers_with_different_user_agents(self) -> None:
-        """Test that different providers can have different user-agents."""
-        # Set up mock proxy server with multiple providers
-        mock_proxy_server = MagicMock()
-        mock_proxy_server.llm_router = MagicMock()
-        mock_proxy_server.llm_router.model_list = [
-            {
-                "model_name": "default",
-                "litellm_params": {
-                    "model": "claude-sonnet-4-5-20250929",
-                    "api_base": "https://api.anthropic.com",
-                },
-            },
-            {
-                "model_name": "vertex_model",
-                "litellm_params": {
-                    "model": "gemini-2.5-pro",
-                },
-            },
-        ]
-
-        mock_module = MagicMock()
-        mock_module.proxy_server = mock_proxy_server
-
-        # Create config with multiple providers with different user-agents
-        # Use passthrough mode so the requested model is used directly
-        yaml_content = """
+# Create config with multiple providers with different user-agents
+# Use passthrough mode so the requested model is used directly
+_MULTI_PROVIDER_YAML = """
 ccproxy:
   oat_sources:
     anthropic:
@@ -430,47 +188,108 @@ ccproxy:
     - ccproxy.hooks.model_router
     - ccproxy.hooks.forward_oauth
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = Path(f.name)
-
-        try:
-            config = CCProxyConfig.from_yaml(yaml_path)
-            from ccproxy.config import set_config_instance
-
-            set_config_instance(config)
-
-            with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-                clear_router()
-                handler = CCProxyHandler()
-
-                # Test Anthropic request
-                anthropic_data = {
-                    "model": "claude-sonnet-4-5-20250929",
-                    "messages": [{"role": "user", "content": "test"}],
-                    "metadata": {},
-                    "provider_specific_header": {"extra_headers": {}},
-                    "proxy_server_request": {"headers": {"user-agent": "original/1.0"}},
-                    "secret_fields": {"raw_headers": {"authorization": "Bearer anthropic-token-123"}},
-                }
-
-                result = await handler.async_pre_call_hook(anthropic_data, {})
-                assert result["provider_specific_header"]["extra_headers"]["user-agent"] == "AnthropicClient/1.0"
-
-                # Test Gemini request
-                gemini_data = {
-                    "model": "gemini-2.5-pro",
-                    "messages": [{"role": "user", "content": "test"}],
-                    "metadata": {},
-                    "provider_specific_header": {"extra_headers": {}},
-                    "proxy_server_request": {"headers": {"user-agent": "original/1.0"}},
-                    "secret_fields": {"raw_headers": {"authorization": "Bearer vertex-ai-token-456"}},
-                }
-
-                result = await handler.async_pre_call_hook(gemini_data, {})
-                assert result["provider_specific_header"]["extra_headers"]["user-agent"] == "VertexAIClient/2.0"
-
-        finally:
-            yaml_path.unlink()
-            clear_config_instance()
-            clear_router()
+
+
+def make_forwarding_request(model: str, client_user_agent: str, token: str) -> dict[str, Any]:
+    """Build a pre-call request for ``model`` sent by ``client_user_agent`` with a bearer ``token``."""
+    return {
+        "model": model,
+        "messages": [{"role": "user", "content": "test"}],
+        "metadata": {},
+        "provider_specific_header": {"extra_headers": {}},
+        "proxy_server_request": {"headers": {"user-agent": client_user_agent}},
+        "secret_fields": {"raw_headers": {"authorization": f"Bearer {token}"}},
+    }
+
+
+@pytest.fixture
+def forwarding_handler(patch_litellm_proxy) -> Iterator[Callable[[str, list[dict[str, Any]]], CCProxyHandler]]:
+    """Factory that installs an in-memory ccproxy.yaml and a mocked model list, then builds a handler.
+
+    The mocked proxy server stays installed until the test finishes; the autouse cleanup
+    fixture resets the config/router singletons afterwards.
+    """
+    with ExitStack() as stack:
+
+        def _build(yaml_content: str, model_list: list[dict[str, Any]]) -> CCProxyHandler:
+            set_config_instance(CCProxyConfig.from_yaml_string(yaml_content))
+            stack.enter_context(patch_litellm_proxy(model_list))
+            return CCProxyHandler()
+
+        yield _build
+
+
+class TestOAuthUserAgentForwarding:
+    """Tests for User-Agent header forwarding in forward_oauth hook."""
+
+    @pytest.mark.parametrize(
+        ("yaml_content", "model_list", "model", "client_user_agent", "token", "expected_user_agent"),
+        [
+            pytest.param(
+                _VERTEX_CUSTOM_UA_YAML,
+                _GEMINI_MODEL_LIST,
+                "gemini-2.5-pro",
+                "original-client/1.0",
+                "vertex-ai-token-123",
+                "MyCustomApp/3.0.0",
+                id="custom_user_agent_forwarded",
+            ),
+            pytest.param(
+                _ANTHROPIC_NO_UA_YAML,
+                _ANTHROPIC_MODEL_LIST,
+                "claude-sonnet-4-5-20250929",
+                "claude-cli/1.0.62",
+                "anthropic-token-123",
+                None,
+                id="no_user_agent_when_not_configured",
+            ),
+            pytest.param(
+                _VERTEX_OVERRIDE_UA_YAML,
+                _GEMINI_MODEL_LIST,
+                "gemini-2.5-pro",
+                "OriginalClient/9.9.9",
+                "vertex-ai-token-123",
+                "ProxyOverride/1.0",
+                id="user_agent_overrides_original",
+            ),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_user_agent_forwarding(
+        self,
+        forwarding_handler,
+        yaml_content: str,
+        model_list: list[dict[str, Any]],
+        model: str,
+        client_user_agent: str,
+        token: str,
+        expected_user_agent: str | None,
+    ) -> None:
+        """Test the configured user-agent replaces the client's, and none is set when not configured."""
+        handler = forwarding_handler(yaml_content, model_list)
+
+        result = await handler.async_pre_call_hook(make_forwarding_request(model, client_user_agent, token), {})
+
+        extra_headers = result["provider_specific_header"]["extra_headers"]
+        assert extra_headers.get("user-agent") == expected_user_agent
+        # Authorization is forwarded either way
+        assert extra_headers["authorization"] == f"Bearer {token}"
+
+    @pytest.mark.asyncio
+    async def test_multiple_providers_with_different_user_agents(self, forwarding_handler) -> None:
+        """Test that different providers can have different user-agents."""
+        model_list = [
+            *_ANTHROPIC_MODEL_LIST,
+            {"model_name": "vertex_model", "litellm_params": {"model": "gemini-2.5-pro"}},
+        ]
+        handler = forwarding_handler(_MULTI_PROVIDER_YAML, model_list)
+
+        # Test Anthropic request
+        anthropic_data = make_forwarding_request("claude-sonnet-4-5-20250929", "original/1.0", "anthropic-token-123")
+        result = await handler.async_pre_call_hook(anthropic_data, {})
+        assert result["provider_specific_header"]["extra_headers"]["user-agent"] == "AnthropicClient/1.0"
+
+        # Test Gemini request
+        gemini_data = make_forwarding_request("gemini-2.5-pro", "original/1.0", "vertex-ai-token-456")
+        result = await handler.async_pre_call_hook(gemini_data, {})
+        assert result["provider_specific_header"]["extra_headers"]["user-agent"] == "VertexAIClient/2.0"
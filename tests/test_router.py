@@ -1,5 +1,6 @@
 """Tests for the ModelRouter component."""
 
+import sys
 import threading
 from unittest.mock import MagicMock, patch
 
@@ -11,13 +12,6 @@ from ccproxy.router import ModelRouter, clear_router, get_router
 class TestModelRouter:
     """Test suite for ModelRouter."""
 
-    @pytest.fixture(autouse=True)
-    def setup_cleanup(self):
-        """Clear router singleton before each test."""
-        clear_router()
-        yield
-        clear_router()
-
     def _create_router_with_models(self, model_list: list) -> ModelRouter:
         """Helper to create a router with mocked models."""
         # Create a mock that will be returned by the import
@@ -183,20 +177,20 @@ class TestModelRouter:
         assert router.get_model_list() == []
         assert router.get_model_for_label("anything") is None
 
-    def test_no_proxy_server(self) -> None:
+    def test_no_proxy_server(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test handling when proxy_server is not available."""
         # Create a mock module without proxy_server
         mock_module = MagicMock()
         mock_module.proxy_server = None
 
-        with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-            router = ModelRouter()
+        monkeypatch.setitem(sys.modules, "litellm.proxy", mock_module)
+        router = ModelRouter()
 
         assert router.get_available_models() == []
         assert router.get_model_list() == []
         assert router.get_model_for_label("anything") is None
 
-    def test_no_llm_router(self) -> None:
+    def test_no_llm_router(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test handling when proxy_server has no llm_router."""
         # Create a mock with no llm_router
         mock_proxy_server = MagicMock()
@@ -205,14 +199,14 @@ class TestModelRouter:
         mock_module = MagicMock()
         mock_module.proxy_server = mock_proxy_server
 
-        with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-            router = ModelRouter()
+        monkeypatch.setitem(sys.modules, "litellm.proxy", mock_module)
+        router = ModelRouter()
 
         assert router.get_available_models() == []
         assert router.get_model_list() == []
         assert router.get_model_for_label("anything") is None
 
-    def test_missing_model_list(self) -> None:
+    def test_missing_model_list(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test handling when llm_router has no model_list."""
         # Create a mock with None model_list
         mock_proxy_server = MagicMock()
@@ -222,8 +216,8 @@ class TestModelRouter:
         mock_module = MagicMock()
         mock_module.proxy_server = mock_proxy_server
 
-        with patch.dict("sys.modules", {"litellm.proxy": mock_module}):
-            router = ModelRouter()
+        monkeypatch.setitem(sys.modules, "litellm.proxy", mock_module)
+        router = ModelRouter()
 
         assert router.get_available_models() == []
         assert router.get_model_list() == []
@@ -1,5 +1,7 @@
 """Tests for classification rules."""
 
+from unittest.mock import MagicMock, patch
+
 import pytest
 
 from ccproxy.config import CCProxyConfig
@@ -106,8 +108,6 @@ class TestTokenCountRule:
 
     def test_tokenizer_exception_handling(self, config: CCProxyConfig) -> None:
         """Test tokenizer exception handling (lines 81-83)."""
-        from unittest.mock import patch
-
         rule = TokenCountRule(threshold=10)
 
         # Mock tiktoken import to fail, triggering the except block on lines 81-83
@@ -127,8 +127,6 @@ class TestTokenCountRule:
 
     def test_token_encoding_exception_handling(self, config: CCProxyConfig) -> None:
         """Test token encoding exception handling (lines 99-105)."""
-        from unittest.mock import MagicMock, patch
-
         rule = TokenCountRule(threshold=10)
 
         # Create a mock tokenizer that raises exception on encode